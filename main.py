@@ -1,17 +1,36 @@
-import io
 import os
+import hashlib
+import json
+import pathlib
+import re
+import functools
+import gc
+import random
+import threading
+import logging
 import requests
-from bs4 import BeautifulSoup
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 from docx import Document
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import pymongo
-from deep_translator import GoogleTranslator, exceptions
+from deep_translator import GoogleTranslator
 import asyncio
 import telegram
+from telegram.request import HTTPXRequest
 import tempfile
-import subprocess
 from docx2pdf import convert
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+logger = logging.getLogger(__name__)
 
 # MongoDB setup
 DB_NAME = os.environ.get('DB_NAME')
@@ -21,34 +40,198 @@ MONGO_CONNECTION_STRING = os.environ.get('MONGO_CONNECTION_STRING')
 if not all([DB_NAME, COLLECTION_NAME, MONGO_CONNECTION_STRING]):
     raise ValueError("One or more required MongoDB environment variables are not set")
 
-client = pymongo.MongoClient(MONGO_CONNECTION_STRING)
+client = pymongo.AsyncMongoClient(
+    MONGO_CONNECTION_STRING,
+    appname='gktoday',
+    maxPoolSize=20,
+    minPoolSize=4,
+    serverSelectionTimeoutMS=3000,
+    retryWrites=True,
+    compressors='zstd,zlib',
+    zlibCompressionLevel=6,
+)
 db = client[DB_NAME]
 collection = db[COLLECTION_NAME]
+translation_collection = db['translations']
+
+async def dedupe_urls():
+    # Older runs could insert the same URL twice; the unique index can't be built until they're gone
+    duplicates = await collection.aggregate([
+        {'$group': {'_id': '$url', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+    ])
+    async for group in duplicates:
+        await collection.delete_many({'_id': {'$in': group['ids'][1:]}})
+
+async def ensure_indexes():
+    if 'url_1' not in await collection.index_information():
+        await dedupe_urls()
+    await asyncio.gather(
+        collection.create_index('url', unique=True),
+        translation_collection.create_index('hash', unique=True),
+        translation_collection.create_index('ts', expireAfterSeconds=15 * 24 * 60 * 60),
+    )
+
+# Telegram setup
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHANNEL_ID = os.environ.get('TELEGRAM_CHANNEL_ID')
+
+if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHANNEL_ID:
+    raise ValueError("TELEGRAM_BOT_TOKEN or TELEGRAM_CHANNEL_ID environment variable is not set")
+
+bot = telegram.Bot(
+    token=TELEGRAM_BOT_TOKEN,
+    request=HTTPXRequest(connection_pool_size=16, read_timeout=60, connect_timeout=5, http_version='2'),
+)
+
+# HTTP setup
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+FETCH_ATTEMPTS = 4
+FETCH_SEMAPHORE = asyncio.Semaphore(16)
 
-def fetch_article_urls(base_url, pages):
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=RETRY_STATUS_CODES),
+))
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+SESSION.headers['User-Agent'] = USER_AGENT
+
+# Template cache
+TEMPLATE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'gktoday')
+TEMPLATE_DOWNLOAD_TIMEOUT = (5, 60)  # (connect, read) seconds
+
+# Scratch files live in RAM where a tmpfs is available
+TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+CAPTION_FOOTER = "🎉 Join us :- @CurrentAdda 🎉"
+
+async def fetch_page(http_client, url):
+    for attempt in range(FETCH_ATTEMPTS):
+        try:
+            async with FETCH_SEMAPHORE:
+                response = await http_client.get(url)
+        except httpx.TransportError:
+            if attempt == FETCH_ATTEMPTS - 1:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == FETCH_ATTEMPTS - 1:
+                response.raise_for_status()
+                return response
+        # Back off outside the semaphore so a retrying URL doesn't hold a slot while idle
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def fetch_article_urls(http_client, base_url, pages):
+    page_urls = [base_url if page == 1 else f"{base_url}page/{page}/" for page in range(1, pages + 1)]
+    responses = await asyncio.gather(*(fetch_page(http_client, url) for url in page_urls))
     article_urls = []
-    for page in range(1, pages + 1):
-        url = base_url if page == 1 else f"{base_url}page/{page}/"
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
+    for response in responses:
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('h1', id='list'))
         for h1_tag in soup.find_all('h1', id='list'):
             a_tag = h1_tag.find('a')
             if a_tag and a_tag.get('href'):
                 article_urls.append(a_tag['href'])
     return article_urls
 
+ARTICLE_STRAINER = SoupStrainer('div', class_='inside_post column content_width')
+CONTENT_SELECTOR = soupsieve.compile(':scope > :is(p, h2, h4, ul):not(.sharethis-inline-share-buttons, .prenext)')
+TAG_TYPES = {'p': 'paragraph', 'h2': 'heading_2', 'h4': 'heading_4'}
+
+# GoogleTranslator keeps per-request state on the instance, so each worker thread gets its own
+TRANSLATORS = threading.local()
+
+def get_translator():
+    translator = getattr(TRANSLATORS, 'translator', None)
+    if translator is None:
+        translator = TRANSLATORS.translator = GoogleTranslator(source='auto', target='gu')
+    return translator
+
+LATIN_LETTER = re.compile(r'[A-Za-z]')
+URL_ONLY = re.compile(r'https?://\S+')
+
+def needs_translation(text):
+    stripped = text.strip()
+    return len(stripped) >= 2 and LATIN_LETTER.search(stripped) is not None and not URL_ONLY.fullmatch(stripped)
+
+@functools.lru_cache(maxsize=8192)
 def translate_to_gujarati(text):
-    try:
-        translator = GoogleTranslator(source='auto', target='gu')
-        return translator.translate(text)
-    except exceptions.TranslationNotFoundException:
+    if not needs_translation(text):
         return text
+    try:
+        return get_translator().translate(text)
     except Exception:
         return text
 
-async def scrape_and_get_content(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+TRANSLATION_CACHE = {}
+
+# Google rejects requests over 5000 characters
+TRANSLATION_CHUNK_CHARS = 4500
+TRANSLATION_SEMAPHORE = asyncio.Semaphore(8)
+
+def translate_chunk(texts):
+    stripped = [text.strip() for text in texts]
+    results = [None] * len(texts)
+    # Multi-line texts would break the newline-joined batch, so only they are sent on their own
+    single_line = [i for i, text in enumerate(stripped) if '\n' not in text]
+    if len(single_line) > 1:
+        try:
+            translated = get_translator().translate('\n'.join(stripped[i] for i in single_line))
+            lines = translated.split('\n') if translated else []
+            if len(lines) == len(single_line):
+                for i, line in zip(single_line, lines):
+                    results[i] = line
+        except Exception:
+            pass
+    return [translate_to_gujarati(text) if result is None else result for text, result in zip(texts, results)]
+
+def translate_batch_uncached(texts):
+    results = []
+    chunk = []
+    chunk_chars = 0
+    for text in texts:
+        if chunk and chunk_chars + len(text) + 1 > TRANSLATION_CHUNK_CHARS:
+            results.extend(translate_chunk(chunk))
+            chunk = []
+            chunk_chars = 0
+        chunk.append(text)
+        chunk_chars += len(text) + 1
+    if chunk:
+        results.extend(translate_chunk(chunk))
+    return results
+
+async def translate_batch_to_gujarati(texts):
+    hashes = [hashlib.md5(text.encode('utf-8')).hexdigest() if needs_translation(text) else None for text in texts]
+    missing = [h for h in set(hashes) if h and h not in TRANSLATION_CACHE]
+    if missing:
+        try:
+            async for doc in translation_collection.find({'hash': {'$in': missing}}, {'hash': 1, 'gu': 1}):
+                TRANSLATION_CACHE[doc['hash']] = doc['gu']
+        except pymongo.errors.PyMongoError:
+            logger.warning("Translation cache lookup failed; translating without it", exc_info=True)
+    
+    pending = {h: text for h, text in zip(hashes, texts) if h and h not in TRANSLATION_CACHE}
+    if pending:
+        async with TRANSLATION_SEMAPHORE:
+            translated = await asyncio.to_thread(translate_batch_uncached, list(pending.values()))
+        now = datetime.now(timezone.utc)
+        updates = []
+        for (h, text), result in zip(pending.items(), translated):
+            TRANSLATION_CACHE[h] = result
+            # A result equal to the source is usually a swallowed API failure; don't persist it
+            if result and result != text:
+                updates.append(pymongo.UpdateOne({'hash': h}, {'$set': {'gu': result, 'ts': now}}, upsert=True))
+        if updates:
+            try:
+                await translation_collection.bulk_write(updates, ordered=False)
+            except pymongo.errors.PyMongoError:
+                logger.warning("Could not store %d translations in the cache", len(updates), exc_info=True)
+    
+    return [TRANSLATION_CACHE[h] if h else text for h, text in zip(hashes, texts)]
+
+async def scrape_and_get_content(http_client, url):
+    response = await fetch_page(http_client, url)
+    soup = BeautifulSoup(response.content, 'lxml', parse_only=ARTICLE_STRAINER)
     main_content = soup.find('div', class_='inside_post column content_width')
     if not main_content:
         raise Exception("Main content div not found")
@@ -57,38 +240,38 @@ async def scrape_and_get_content(url):
     if not heading:
         raise Exception("Heading not found")
     
-    content_list = []
-    heading_text = heading.get_text()
-    translated_heading = translate_to_gujarati(heading_text)
-    content_list.append({'type': 'heading', 'text': translated_heading})
-    content_list.append({'type': 'heading', 'text': heading_text})
+    items = [('heading', heading.get_text())]
+    for tag in CONTENT_SELECTOR.select(main_content):
+        if tag.name == 'ul':
+            items.extend(('list_item', li.get_text()) for li in tag.find_all('li'))
+        else:
+            items.append((TAG_TYPES[tag.name], tag.get_text()))
     
-    for tag in main_content.find_all(recursive=False):
-        if tag.get('class') in [['sharethis-inline-share-buttons', 'st-center', 'st-has-labels', 'st-inline-share-buttons', 'st-animated'], ['prenext']]:
-            continue
-        text = tag.get_text()
-        translated_text = translate_to_gujarati(text)
-        if tag.name == 'p':
-            content_list.append({'type': 'paragraph', 'text': translated_text})
-            content_list.append({'type': 'paragraph', 'text': text})
-        elif tag.name == 'h2':
-            content_list.append({'type': 'heading_2', 'text': translated_text})
-            content_list.append({'type': 'heading_2', 'text': text})
-        elif tag.name == 'h4':
-            content_list.append({'type': 'heading_4', 'text': translated_text})
-            content_list.append({'type': 'heading_4', 'text': text})
-        elif tag.name == 'ul':
-            for li in tag.find_all('li'):
-                li_text = li.get_text()
-                translated_li_text = translate_to_gujarati(li_text)
-                content_list.append({'type': 'list_item', 'text': f"• {translated_li_text}"})
-                content_list.append({'type': 'list_item', 'text': f"• {li_text}"})
+    translated = await translate_batch_to_gujarati([text for _, text in items])
+    
+    content_list = []
+    for (content_type, text), translated_text in zip(items, translated):
+        if content_type == 'list_item':
+            content_list.append({'type': content_type, 'text': f"• {translated_text}"})
+            content_list.append({'type': content_type, 'text': f"• {text}"})
+        else:
+            content_list.append({'type': content_type, 'text': translated_text})
+            content_list.append({'type': content_type, 'text': text})
     return content_list
 
+CONTENT_STYLES = {
+    'heading': 'Heading 1',
+    'paragraph': 'Normal',
+    'heading_2': 'Heading 2',
+    'heading_4': 'Heading 4',
+    'list_item': 'List Bullet',
+}
+
 def insert_content_between_placeholders(doc, content_list):
     start_placeholder = end_placeholder = None
     
-    for i, para in enumerate(doc.paragraphs):
+    paragraphs = doc.paragraphs
+    for i, para in enumerate(paragraphs):
         if "START_CONTENT" in para.text:
             start_placeholder = i
         elif "END_CONTENT" in para.text:
@@ -98,120 +281,211 @@ def insert_content_between_placeholders(doc, content_list):
     if start_placeholder is None or end_placeholder is None:
         raise Exception("Could not find both placeholders")
 
-    for i in range(end_placeholder - 1, start_placeholder, -1):
-        p = doc.paragraphs[i]
-        p._element.getparent().remove(p._element)
+    start_paragraph = paragraphs[start_placeholder]
+    end_paragraph = paragraphs[end_placeholder]
 
-    content_list = content_list[::-1]
+    for p in paragraphs[start_placeholder + 1:end_placeholder]:
+        p._element.getparent().remove(p._element)
 
+    styles = {}
     for content in content_list:
-        if content['type'] == 'heading':
-            doc.paragraphs[start_placeholder]._element.addnext(doc.add_heading(content['text'], level=1)._element)
-        elif content['type'] == 'paragraph':
-            doc.paragraphs[start_placeholder]._element.addnext(doc.add_paragraph(content['text'], style='Normal')._element)
-        elif content['type'] == 'heading_2':
-            doc.paragraphs[start_placeholder]._element.addnext(doc.add_heading(content['text'], level=2)._element)
-        elif content['type'] == 'heading_4':
-            doc.paragraphs[start_placeholder]._element.addnext(doc.add_heading(content['text'], level=4)._element)
-        elif content['type'] == 'list_item':
-            doc.paragraphs[start_placeholder]._element.addnext(doc.add_paragraph(content['text'], style='List Bullet')._element)
-
-    doc.paragraphs[start_placeholder].text = ""
-    doc.paragraphs[end_placeholder].text = ""
+        content_type = content['type']
+        style = styles.get(content_type)
+        if style is None and content_type in CONTENT_STYLES:
+            style = styles[content_type] = doc.styles[CONTENT_STYLES[content_type]]
+        if style:
+            end_paragraph.insert_paragraph_before(content['text'], style=style)
+
+    start_paragraph.text = ""
+    end_paragraph.text = ""
 
 def download_template(url):
+    cache_path = os.path.join(TEMPLATE_CACHE_DIR, f"template-{hashlib.md5(url.encode('utf-8')).hexdigest()}.docx")
+    validators_path = cache_path + '.json'
+    # Revalidate on every call; a 304 costs one round trip and picks up template edits immediately
+    cached = os.path.exists(cache_path)
+    headers = {}
+    if cached:
+        try:
+            with open(validators_path) as validators_file:
+                validators = json.load(validators_file)
+        except (OSError, ValueError):
+            # Missing or truncated sidecar; just download unconditionally
+            validators = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
     download_url = url.replace('/edit?usp=sharing', '/export?format=docx')
-    try:
-        response = requests.get(download_url)
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    with SESSION.get(download_url, headers=headers, stream=True, timeout=TEMPLATE_DOWNLOAD_TIMEOUT) as response:
+        if response.status_code == 304:
+            return cache_path
         response.raise_for_status()
-        return io.BytesIO(response.content)
-    except requests.exceptions.RequestException:
-        raise
+        validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        with tempfile.NamedTemporaryFile(dir=TEMPLATE_CACHE_DIR, suffix='.part', delete=False) as tmp_template:
+            try:
+                for chunk in response.iter_content(64 * 1024):
+                    tmp_template.write(chunk)
+            except BaseException:
+                tmp_template.close()
+                os.unlink(tmp_template.name)
+                raise
+    os.replace(tmp_template.name, cache_path)
+    
+    with tempfile.NamedTemporaryFile('w', dir=TEMPLATE_CACHE_DIR, suffix='.part', delete=False) as validators_file:
+        json.dump(validators, validators_file)
+    os.replace(validators_file.name, validators_path)
+    return cache_path
 
-def check_and_insert_urls(urls):
-    new_urls = []
-    for url in urls:
-        if 'daily-current-affairs-quiz' in url:
-            continue
-        if not collection.find_one({'url': url}):
-            new_urls.append(url)
-            collection.insert_one({'url': url})
-    return new_urls
+async def check_and_insert_urls(urls):
+    urls = list(dict.fromkeys(url for url in urls if 'daily-current-affairs-quiz' not in url))
+    if not urls:
+        return urls
+    now = datetime.now(timezone.utc)
+    upserts = [pymongo.UpdateOne({'url': url}, {'$setOnInsert': {'url': url, 'ts': now}}, upsert=True) for url in urls]
+    try:
+        upserted = (await collection.bulk_write(upserts, ordered=False)).upserted_ids
+    except pymongo.errors.BulkWriteError as e:
+        # Another run inserted some of these in the meantime; leave those to it
+        if any(error['code'] != 11000 for error in e.details['writeErrors']):
+            raise
+        upserted = {op['index']: op['_id'] for op in e.details['upserted']}
+    return [urls[i] for i in sorted(upserted)]
+
+async def release_urls(urls):
+    if urls:
+        await collection.delete_many({'url': {'$in': urls}})
 
 def convert_docx_to_pdf(docx_path, pdf_path):
     convert(docx_path, pdf_path)
 
-def rename_pdf(pdf_path, new_name):
-    new_pdf_path = os.path.join(os.path.dirname(pdf_path), new_name)
-    os.rename(pdf_path, new_pdf_path)
-    return new_pdf_path
+async def warm_up_bot(bot):
+    # Only saves a handshake on the upload; sending still works without it and retries on its own
+    try:
+        await bot.initialize()
+    except telegram.error.NetworkError:
+        logger.warning("Bot API warm-up failed; continuing without it", exc_info=True)
+
+TELEGRAM_ATTEMPTS = 5
 
-async def send_pdf_to_telegram(pdf_path, bot_token, channel_id, caption):
-    bot = telegram.Bot(token=bot_token)
-    for _ in range(3):
+async def send_pdf_to_telegram(bot, pdf_bytes, filename, channel_id, caption):
+    for attempt in range(TELEGRAM_ATTEMPTS):
         try:
-            with open(pdf_path, 'rb') as pdf_file:
-                await bot.send_document(chat_id=channel_id, document=pdf_file, filename=os.path.basename(pdf_path), caption=caption)
+            await bot.send_document(
+                chat_id=channel_id,
+                document=pdf_bytes,
+                filename=filename,
+                caption=caption,
+                read_timeout=120,
+                write_timeout=120,
+            )
             break
-        except telegram.error.TimedOut:
-            await asyncio.sleep(5)
+        except telegram.error.RetryAfter as e:
+            if attempt == TELEGRAM_ATTEMPTS - 1:
+                raise
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                # PTB >= 22.2 returns a timedelta when PTB_TIMEDELTA is set
+                retry_after = retry_after.total_seconds()
+            await asyncio.sleep(retry_after + random.uniform(0, 1))
+        except telegram.error.BadRequest:
+            raise
+        except telegram.error.NetworkError:
+            if attempt == TELEGRAM_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(min(30, 0.5 * 2 ** attempt) + random.uniform(0, 1))
 
 async def main():
+    new_urls = []
+    parse_failures = set()
     try:
         base_url = "https://www.gktoday.in/current-affairs/"
-        article_urls = fetch_article_urls(base_url, 2)
-        new_urls = check_and_insert_urls(article_urls)
-        if not new_urls:
-            return
+        async with httpx.AsyncClient(
+            http2=True,
+            headers={'User-Agent': USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        ) as http_client:
+            article_urls = await fetch_article_urls(http_client, base_url, 2)
+            new_urls = await check_and_insert_urls(article_urls)
+            if not new_urls:
+                return
+            
+            template_url = os.environ.get('TEMPLATE_URL')
+            if not template_url:
+                raise ValueError("TEMPLATE_URL environment variable is not set")
+            
+            # Warm up the Bot API connection while the articles are scraped
+            template_path, results, _ = await asyncio.gather(
+                asyncio.to_thread(download_template, template_url),
+                asyncio.gather(*(scrape_and_get_content(http_client, url) for url in new_urls), return_exceptions=True),
+                warm_up_bot(bot),
+            )
         
-        template_url = os.environ.get('TEMPLATE_URL')
-        if not template_url:
-            raise ValueError("TEMPLATE_URL environment variable is not set")
-        
-        template_bytes = download_template(template_url)
-        
-        doc = Document(template_bytes)
+        doc = Document(template_path)
         
         all_content = []
         english_titles = []
-        for url in new_urls:
-            content_list = await scrape_and_get_content(url)
+        failed_urls = []
+        for url, content_list in zip(new_urls, results):
+            if isinstance(content_list, BaseException):
+                logger.error("Failed to scrape %s", url, exc_info=content_list)
+                if isinstance(content_list, httpx.HTTPError):
+                    failed_urls.append(url)
+                else:
+                    # A page that doesn't parse now won't parse on the next run either; keep its claim
+                    parse_failures.add(url)
+                continue
             all_content.extend(content_list)
             english_titles.append(content_list[0]['text'])  # Assuming the first item is the title
+        # Pages that couldn't be fetched go back to the pool for the next run
+        await release_urls(failed_urls)
+        if not all_content:
+            raise RuntimeError(f"None of the {len(new_urls)} new articles could be scraped")
         
         insert_content_between_placeholders(doc, all_content)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx', dir=TEMP_DIR) as tmp_docx:
             doc.save(tmp_docx.name)
+        # python-docx parts reference each other, so the tree is only freed by the cycle collector
+        del doc
+        gc.collect()
         
-        pdf_path = tmp_docx.name.replace('.docx', '.pdf')
+        pdf_path = os.path.splitext(tmp_docx.name)[0] + '.pdf'
         
         convert_docx_to_pdf(tmp_docx.name, pdf_path)
+        pdf_bytes = await asyncio.to_thread(pathlib.Path(pdf_path).read_bytes)
+        os.unlink(tmp_docx.name)
+        os.unlink(pdf_path)
         
-        # Rename the PDF file
         current_date = datetime.now().strftime('%d-%m-%Y')
-        new_pdf_name = f"{current_date} Current Affairs.pdf"
-        renamed_pdf_path = rename_pdf(pdf_path, new_pdf_name)
-        
-        bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
-        channel_id = os.environ.get('TELEGRAM_CHANNEL_ID')
-        
-        if not bot_token or not channel_id:
-            raise ValueError("TELEGRAM_BOT_TOKEN or TELEGRAM_CHANNEL_ID environment variable is not set")
+        pdf_name = f"{current_date} Current Affairs.pdf"
         
         caption = (
             f"🎗️ {datetime.now().strftime('%d %B %Y')} Current Affairs 🎗️\n\n"
             + '\n'.join([f"👉 {title}" for title in english_titles]) + '\n\n'
-            + "🎉 Join us :- @CurrentAdda 🎉"
+            + CAPTION_FOOTER
         )
         
-        await send_pdf_to_telegram(renamed_pdf_path, bot_token, channel_id, caption)
-        
-        os.unlink(tmp_docx.name)
-        os.unlink(renamed_pdf_path)
-        
-    except Exception as e:
+        await send_pdf_to_telegram(bot, pdf_bytes, pdf_name, TELEGRAM_CHANNEL_ID, caption)
+    except BaseException:
+        # Nothing was posted; release every claim except pages that will never parse so the next run retries them
+        await release_urls([url for url in new_urls if url not in parse_failures])
         raise
 
+async def run():
+    try:
+        await ensure_indexes()
+        await main()
+    finally:
+        await bot.shutdown()
+        await client.close()
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(run())
+    else:
+        asyncio.run(run())